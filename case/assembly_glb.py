@@ -0,0 +1,328 @@
+"""
+Chocofi Assembly GLB
+====================
+Run in FreeCAD after top.py and bottom.py: exec(open("/path/to/assembly_glb.py").read())
+Headless:                                  freecadcmd case/assembly_glb.py
+
+Writes the top plate and bottom case as one glTF binary, mated as printed
+(plate underside resting on the case ridge), for quick browser previews.
+
+- Several levels of detail per part (MSFT_lod). The finest one reuses the
+  tessellation already written to the STL, coarser ones re-tessellate the
+  STEP with a larger deflection
+- Indexed, quantized vertex buffers (KHR_mesh_quantization): uint16 positions
+  dequantized by the node transform, uint16/uint32 indices
+- Binary chunk ordered coarsest LOD first, so a viewer reading the file
+  progressively can show low detail before the rest arrives
+- No normals: viewers shade flat, which suits the faceted CAD geometry
+"""
+
+import FreeCAD
+import Part
+import json
+import os
+import struct
+import sys
+from array import array
+
+# ══════════════════════════════════════════
+# PARAMETERS
+# ══════════════════════════════════════════
+OUTPUT_DIR = os.path.expanduser("~")  # where top.py / bottom.py wrote STEP/STL
+
+# Linear deflection (mm) per LOD, finest first. None = reuse the STL mesh,
+# which Mesh.export writes at FreeCAD's default 0.1 mm deviation, so the
+# coarser levels start well above that.
+LOD_DEFLECTIONS = [None, 0.3, 0.8, 2.0]
+# MSFT_screencoverage: switch to the next LOD below this share of the screen
+LOD_SCREEN_COVERAGE = [0.5, 0.2, 0.05, 0.0]
+STL_FALLBACK_DEFLECTION = 0.05  # mm, when the STL has not been exported
+
+PARTS = [
+    # (node name, export base name, RGBA)
+    ("ChocofiBottomCase", "chocofi_simple_case", [0.18, 0.18, 0.20, 1.0]),
+    ("ChocofiTopPlate", "chocofi_top_plate", [0.85, 0.85, 0.82, 1.0]),
+]
+
+QUANT_MAX = 65535  # uint16 position grid
+RIDGE_PROBE_INSET = 0.3  # mm in from the case's outer face, inside the ridge
+
+if len(LOD_SCREEN_COVERAGE) != len(LOD_DEFLECTIONS):
+    raise ValueError("LOD_SCREEN_COVERAGE needs exactly one entry per LOD")
+
+# glTF constants
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+TRIANGLES = 4
+
+# ══════════════════════════════════════════
+# TESSELLATION
+# ══════════════════════════════════════════
+
+
+def load_lods(base):
+    """Return (shape, [(points, triangles), ...]) finest first."""
+    shape = Part.read(os.path.join(OUTPUT_DIR, base + ".step"))
+    stl_path = os.path.join(OUTPUT_DIR, base + ".stl")
+    lods = []
+    for deflection in LOD_DEFLECTIONS:
+        if deflection is None and os.path.exists(stl_path):
+            import Mesh
+
+            lods.append(Mesh.Mesh(stl_path).Topology)
+        else:
+            # mustRefine: OCC otherwise keeps the finer mesh already on the shape
+            lods.append(shape.tessellate(deflection or STL_FALLBACK_DEFLECTION, True))
+    return shape, lods
+
+
+def quantize(points, triangles, lo, step):
+    """Snap points to the uint16 grid, weld duplicates, drop degenerate faces.
+
+    Positions are padded to 4 components so each vertex stays 4-byte aligned
+    as glTF requires for vertex attributes.
+    """
+    grid = {}
+    remap = []
+    positions = array("H")
+    for p in points:
+        q = tuple(
+            min(QUANT_MAX, max(0, round((p[k] - lo[k]) / step[k]))) for k in range(3)
+        )
+        i = grid.get(q)
+        if i is None:
+            i = grid[q] = len(grid)
+            positions.extend(q + (0,))
+        remap.append(i)
+
+    indices = array("I")
+    for a, b, c in triangles:
+        a, b, c = remap[a], remap[b], remap[c]
+        if a != b and b != c and a != c:
+            indices.extend((a, b, c))
+    if len(grid) <= 0xFFFF:
+        indices = array("H", indices)
+
+    quantized = list(grid)
+    q_min = [min(q[k] for q in quantized) for k in range(3)]
+    q_max = [max(q[k] for q in quantized) for k in range(3)]
+    return positions, indices, len(grid), q_min, q_max
+
+
+# ══════════════════════════════════════════
+# MATING
+# ══════════════════════════════════════════
+
+
+def ridge_top(case):
+    """Z of the snap-fit ridge, probed just inside the case's outer wall.
+
+    Not the bounding box: standoffs or other features may rise above it.
+    """
+    bb = case.BoundBox
+    z = bb.ZMin + 0.5
+    outside = FreeCAD.Vector(bb.XMin - 10, bb.Center.y, z)
+    wall = case.distToShape(Part.Vertex(outside))[1][0][0]
+    inward = wall - outside
+    inward.z = 0
+    inward.normalize()
+    p = wall + inward * RIDGE_PROBE_INSET
+    probe = Part.makeLine(
+        FreeCAD.Vector(p.x, p.y, bb.ZMin - 1), FreeCAD.Vector(p.x, p.y, bb.ZMax + 1)
+    )
+    # Follow the wall column up from the floor to its first gap
+    top = None
+    for edge in sorted(case.common(probe).Edges, key=lambda e: e.BoundBox.ZMin):
+        if top is not None and edge.BoundBox.ZMin > top + 1e-6:
+            break
+        top = edge.BoundBox.ZMax
+    if top is None:
+        raise RuntimeError("ridge probe missed the bottom case wall")
+    return top
+
+
+# ══════════════════════════════════════════
+# GLB
+# ══════════════════════════════════════════
+
+
+class GlbWriter:
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "chocofi assembly_glb.py"},
+            "extensionsUsed": ["KHR_mesh_quantization", "MSFT_lod"],
+            "extensionsRequired": ["KHR_mesh_quantization"],
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [],
+        }
+        self.bin = bytearray()
+
+    def add(self, key, item):
+        self.gltf[key].append(item)
+        return len(self.gltf[key]) - 1
+
+    def buffer_view(self, data, target, stride=None):
+        if sys.byteorder != "little":
+            data = array(data.typecode, data)
+            data.byteswap()
+        raw = data.tobytes()
+        self.bin.extend(b"\0" * (-len(self.bin) % 4))
+        view = {
+            "buffer": 0,
+            "byteOffset": len(self.bin),
+            "byteLength": len(raw),
+            "target": target,
+        }
+        if stride:
+            view["byteStride"] = stride
+        self.bin.extend(raw)
+        return self.add("bufferViews", view)
+
+    def mesh(self, name, lod, material):
+        positions, indices, count, q_min, q_max = lod
+        pos = self.add(
+            "accessors",
+            {
+                "bufferView": self.buffer_view(positions, ARRAY_BUFFER, stride=8),
+                "componentType": UNSIGNED_SHORT,
+                "count": count,
+                "type": "VEC3",
+                "min": q_min,
+                "max": q_max,
+            },
+        )
+        idx = self.add(
+            "accessors",
+            {
+                "bufferView": self.buffer_view(indices, ELEMENT_ARRAY_BUFFER),
+                "componentType": (
+                    UNSIGNED_SHORT if indices.typecode == "H" else UNSIGNED_INT
+                ),
+                "count": len(indices),
+                "type": "SCALAR",
+            },
+        )
+        primitive = {
+            "attributes": {"POSITION": pos},
+            "indices": idx,
+            "material": material,
+            "mode": TRIANGLES,
+        }
+        return self.add("meshes", {"name": name, "primitives": [primitive]})
+
+    def write(self, path):
+        self.bin.extend(b"\0" * (-len(self.bin) % 4))
+        self.gltf["buffers"].append({"byteLength": len(self.bin)})
+        body = json.dumps(self.gltf, separators=(",", ":")).encode()
+        body += b" " * (-len(body) % 4)
+        total = 12 + 8 + len(body) + 8 + len(self.bin)
+        with open(path, "wb") as f:
+            f.write(struct.pack("<4sII", b"glTF", 2, total))
+            f.write(struct.pack("<I4s", len(body), b"JSON"))
+            f.write(body)
+            f.write(struct.pack("<I4s", len(self.bin), b"BIN\0"))
+            f.write(self.bin)
+        return total
+
+
+# ══════════════════════════════════════════
+# BUILD
+# ══════════════════════════════════════════
+parts = []
+for name, base, color in PARTS:
+    shape, lods = load_lods(base)
+    bb = shape.BoundBox
+    lo = [bb.XMin, bb.YMin, bb.ZMin]
+    step = [max(n, 1e-6) / QUANT_MAX for n in (bb.XLength, bb.YLength, bb.ZLength)]
+    parts.append((name, color, shape, lo, step, [quantize(*t, lo, step) for t in lods]))
+shapes = {name: shape for name, color, shape, *_ in parts}
+
+# Plate z=0 (groove roof) sits on the top of the case ridge
+mate_z = {
+    "ChocofiBottomCase": 0.0,
+    "ChocofiTopPlate": ridge_top(shapes["ChocofiBottomCase"]),
+}
+
+glb = GlbWriter()
+materials = {
+    name: glb.add(
+        "materials",
+        {
+            "name": name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": color,
+                "metallicFactor": 0.0,
+                "roughnessFactor": 0.8,
+            },
+        },
+    )
+    for name, color, *_ in parts
+}
+lod_nodes = {name: [None] * len(LOD_DEFLECTIONS) for name, *_ in parts}
+
+# Coarsest LOD of every part first, so the binary chunk streams low detail first
+for level in reversed(range(len(LOD_DEFLECTIONS))):
+    for name, color, shape, lo, step, lods in parts:
+        mesh = glb.mesh(f"{name}_LOD{level}", lods[level], materials[name])
+        # Node transform dequantizes: position = q * step + lo
+        lod_nodes[name][level] = glb.add(
+            "nodes",
+            {
+                "name": f"{name}_LOD{level}",
+                "mesh": mesh,
+                "translation": lo,
+                "scale": step,
+            },
+        )
+
+children = []
+for name, *_ in parts:
+    finest, *coarser = lod_nodes[name]
+    node = glb.gltf["nodes"][finest]
+    if coarser:
+        node["extensions"] = {"MSFT_lod": {"ids": coarser}}
+        node["extras"] = {"MSFT_screencoverage": LOD_SCREEN_COVERAGE}
+    children.append(
+        glb.add(
+            "nodes",
+            {
+                "name": name,
+                "translation": [0.0, 0.0, mate_z[name]],
+                "children": [finest],
+            },
+        )
+    )
+
+# FreeCAD works in Z-up millimetres, glTF in Y-up metres
+root = glb.add(
+    "nodes",
+    {
+        "name": "ChocofiAssembly",
+        "rotation": [-0.7071068, 0.0, 0.0, 0.7071068],
+        "scale": [0.001, 0.001, 0.001],
+        "children": children,
+    },
+)
+glb.gltf["scenes"][0]["nodes"].append(root)
+
+glb_path = os.path.join(OUTPUT_DIR, "chocofi_assembly.glb")
+size = glb.write(glb_path)
+print(f"GLB  -> {glb_path}")
+
+print(f"\nDone! Assembly: {size / 1024:.0f} KiB, {len(LOD_DEFLECTIONS)} LODs per part")
+for name, color, shape, lo, step, lods in parts:
+    counts = [len(lod[1]) // 3 for lod in lods]
+    print(
+        f"  {name}: {', '.join(map(str, counts))} triangles (LOD0..LOD{len(lods) - 1})"
+    )
+    if any(finer <= coarser for finer, coarser in zip(counts, counts[1:])):
+        print(f"  Warning: {name} LODs do not get coarser, check LOD_DEFLECTIONS")
+print(f"  Top plate mated at Z = {mate_z['ChocofiTopPlate']:.1f} mm")
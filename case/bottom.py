@@ -10,6 +10,8 @@ import os
 # ══════════════════════════════════════════
 # PARAMETERS
 # ══════════════════════════════════════════
+OUTPUT_DIR = os.path.expanduser("~")  # where STEP/STL are written
+EXPORT = True  # False builds the shape only (see report.py)
 WALL_THICKNESS = 2.2  # mm border wall thickness
 FLOOR_THICKNESS = 1.2  # mm
 WALL_HEIGHT = 5.0  # mm height of border walls above the floor
@@ -155,23 +157,24 @@ case = case.removeSplitter()
 # ══════════════════════════════════════════
 # EXPORT
 # ══════════════════════════════════════════
-doc = FreeCAD.newDocument("ChocofiCase")
-part = doc.addObject("Part::Feature", "ChocofiBottomCase")
-part.Shape = case
-doc.recompute()
-
-step_path = os.path.expanduser("~/chocofi_simple_case.step")
-Part.export([part], step_path)
-print(f"STEP -> {step_path}")
-
-try:
-    import Mesh
-
-    stl_path = os.path.expanduser("~/chocofi_simple_case.stl")
-    Mesh.export([part], stl_path)
-    print(f"STL  -> {stl_path}")
-except Exception as e:
-    print(f"STL export failed: {e}")
+if EXPORT:
+    doc = FreeCAD.newDocument("ChocofiCase")
+    part = doc.addObject("Part::Feature", "ChocofiBottomCase")
+    part.Shape = case
+    doc.recompute()
+
+    step_path = os.path.join(OUTPUT_DIR, "chocofi_simple_case.step")
+    Part.export([part], step_path)
+    print(f"STEP -> {step_path}")
+
+    try:
+        import Mesh
+
+        stl_path = os.path.join(OUTPUT_DIR, "chocofi_simple_case.stl")
+        Mesh.export([part], stl_path)
+        print(f"STL  -> {stl_path}")
+    except Exception as e:
+        print(f"STL export failed: {e}")
 
 bb = case.BoundBox
 print(f"\nDone! Case: {bb.XLength:.1f} x {bb.YLength:.1f} x {bb.ZLength:.1f} mm")
@@ -0,0 +1,410 @@
+"""
+Chocofi Build Service
+=====================
+Run: python case/build_service.py [--workers 2] [--port 8765]
+
+Local HTTP service that builds case variants on a pool of warm headless
+FreeCAD workers (see build_worker.py) and serves the STEP/STL results.
+
+- Parameter sets are normalized (upper-case names, rounded values, defaults
+  dropped) and hashed together with the script source
+- Identical requests share one build: while it is queued or running every
+  caller gets the same job, once done the artifacts are served from the store
+- Artifacts persist in the store directory across restarts
+
+API (localhost only by default):
+  GET  /parts                    overridable parameters and defaults per part
+  POST /builds[?wait=1]          {"part": "top", "params": {"TOWER_HEIGHT": 8}}
+  GET  /builds/<id>              build status and artifact names
+  GET  /builds/<id>/<file>       STEP/STL download
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import mimetypes
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from build_worker import RESULT_TAG, overridable_params
+
+# ══════════════════════════════════════════
+# PARAMETERS
+# ══════════════════════════════════════════
+CASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKER_SCRIPT = os.path.join(CASE_DIR, "build_worker.py")
+
+PARTS = {
+    "top": os.path.join(CASE_DIR, "top.py"),
+    "bottom": os.path.join(CASE_DIR, "bottom.py"),
+}
+
+PARAM_DIGITS = 4  # decimals kept when normalizing (0.1 µm)
+BUILD_ID_LEN = 16  # hex chars of the sha256 used as build id
+BUILD_ID_RE = re.compile(f"^[0-9a-f]{{{BUILD_ID_LEN}}}$")
+
+# ══════════════════════════════════════════
+# BUILDS
+# ══════════════════════════════════════════
+
+
+def load_part(part):
+    """Return (script path, source, defaults) for a part name."""
+    if not isinstance(part, str) or part not in PARTS:
+        raise ValueError(f"unknown part {part!r} (expected one of {sorted(PARTS)})")
+    script = PARTS[part]
+    with open(script) as f:
+        source = f.read()
+    return script, source, overridable_params(source)
+
+
+def normalize_params(params, defaults):
+    """Canonical form of a parameter set: only values that differ from defaults."""
+    if not isinstance(params, dict):
+        raise ValueError("params must be an object")
+    normalized = {}
+    seen = set()
+    for key, value in params.items():
+        name = str(key).upper()
+        if name not in defaults:
+            raise ValueError(f"unknown parameter {key!r}")
+        if name in seen:
+            raise ValueError(f"parameter {name} given more than once")
+        seen.add(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"parameter {name} must be a number")
+        try:
+            value = float(value)  # JSON integers can exceed the float range
+        except OverflowError:
+            raise ValueError(f"parameter {name} is out of range") from None
+        if not math.isfinite(value):
+            raise ValueError(f"parameter {name} must be finite")
+        value = round(value, PARAM_DIGITS)
+        if value != round(float(defaults[name]), PARAM_DIGITS):
+            normalized[name] = value
+    return dict(sorted(normalized.items()))
+
+
+def build_id(part, params, source):
+    key = {
+        "part": part,
+        "params": params,
+        "source": hashlib.sha256(source.encode()).hexdigest(),
+    }
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return digest[:BUILD_ID_LEN]
+
+
+class Build:
+    def __init__(self, id, part, params):
+        self.id = id
+        self.part = part
+        self.params = params
+        self.status = "queued"  # queued -> running -> done | failed
+        self.files = []
+        self.log = ""
+        self.error = None
+        self.finished = threading.Event()
+
+    def to_json(self):
+        data = {
+            "id": self.id,
+            "part": self.part,
+            "params": self.params,
+            "status": self.status,
+            "files": [f"/builds/{self.id}/{name}" for name in self.files],
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class BuildService:
+    def __init__(self, store_dir, workers, freecad_cmd, timeout):
+        self.store_dir = store_dir
+        self.freecad_cmd = freecad_cmd
+        self.timeout = timeout
+        self.builds = {}
+        self.lock = threading.Lock()
+        self.jobs = queue.Queue()
+        os.makedirs(store_dir, exist_ok=True)
+        self.workers = [Worker(self, i) for i in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def describe(self):
+        return {
+            part: {k: round(v, PARAM_DIGITS) for k, v in load_part(part)[2].items()}
+            for part in PARTS
+        }
+
+    def submit(self, part, params):
+        script, source, defaults = load_part(part)
+        params = normalize_params(params, defaults)
+        bid = build_id(part, params, source)
+        with self.lock:
+            build = self.builds.get(bid)
+            if build is not None and build.status != "failed":
+                return build  # coalesce onto the in-flight or finished build
+            build = self._load_stored(bid)
+            if build is None:
+                build = Build(bid, part, params)
+                self.jobs.put((build, script, source))
+            self.builds[bid] = build
+            return build
+
+    def get(self, bid):
+        # Ids come straight from the URL and are joined into store paths
+        if not BUILD_ID_RE.match(bid):
+            return None
+        with self.lock:
+            build = self.builds.get(bid)
+            if build is None:
+                build = self._load_stored(bid)
+                if build is not None:
+                    self.builds[bid] = build
+            return build
+
+    def artifact_path(self, build, name):
+        if build.status != "done" or name not in build.files:
+            return None
+        if "/" in name or os.sep in name or ".." in name:
+            return None
+        return os.path.join(self.store_dir, build.id, name)
+
+    def _load_stored(self, bid):
+        manifest = os.path.join(self.store_dir, bid, "manifest.json")
+        if not os.path.exists(manifest):
+            return None
+        with open(manifest) as f:
+            data = json.load(f)
+        build = Build(bid, data["part"], data["params"])
+        build.files = data["files"]
+        build.log = data["log"]
+        build.status = "done"
+        build.finished.set()
+        return build
+
+    def run(self, worker, build, script, source):
+        build.status = "running"
+        final_dir = os.path.join(self.store_dir, build.id)
+        work_dir = final_dir + ".partial"
+        try:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            os.makedirs(work_dir)
+            result = worker.call(
+                {
+                    "script": script,
+                    "source": source,
+                    "params": build.params,
+                    "output_dir": work_dir,
+                }
+            )
+            build.log = result.get("log", "")
+            if not result["ok"]:
+                raise RuntimeError(result["error"])
+            build.files = sorted(os.listdir(work_dir))
+            with open(os.path.join(work_dir, "manifest.json"), "w") as f:
+                json.dump(
+                    {
+                        "part": build.part,
+                        "params": build.params,
+                        "files": build.files,
+                        "log": build.log,
+                    },
+                    f,
+                    indent=2,
+                )
+            # Publish atomically so a half-written build is never served
+            os.replace(work_dir, final_dir)
+            build.status = "done"
+        except Exception as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            build.error = str(e)
+            build.status = "failed"
+        finally:
+            build.finished.set()
+
+
+# ══════════════════════════════════════════
+# WORKER POOL
+# ══════════════════════════════════════════
+
+
+class Worker(threading.Thread):
+    """Owns one warm FreeCAD process and feeds it builds from the shared queue."""
+
+    def __init__(self, service, index):
+        super().__init__(name=f"chocofi-worker-{index}", daemon=True)
+        self.service = service
+        self.proc = None
+
+    def spawn(self):
+        self.proc = subprocess.Popen(
+            [self.service.freecad_cmd, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=CASE_DIR,
+        )
+
+    def call(self, job):
+        if self.proc is None or self.proc.poll() is not None:
+            self.spawn()
+        # A hung build takes the process down with it; the next job respawns
+        timed_out = threading.Event()
+        proc = self.proc
+
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(self.service.timeout, kill)
+        watchdog.start()
+        noise = []
+        try:
+            self.proc.stdin.write(json.dumps(job) + "\n")
+            self.proc.stdin.flush()
+            for line in self.proc.stdout:
+                if line.startswith(RESULT_TAG):
+                    result = json.loads(line[len(RESULT_TAG) :])
+                    result["log"] = "".join(noise) + result.get("log", "")
+                    return result
+                noise.append(line)
+        except OSError:
+            pass
+        finally:
+            watchdog.cancel()
+        self.proc.kill()
+        self.proc.wait()
+        self.proc = None
+        if timed_out.is_set():
+            raise RuntimeError(
+                f"build killed after {self.service.timeout:g} s timeout:\n"
+                + "".join(noise)
+            )
+        raise RuntimeError("FreeCAD worker exited:\n" + "".join(noise))
+
+    def run(self):
+        try:
+            self.spawn()  # warm up before the first job arrives
+        except OSError as e:
+            print(f"{self.name}: cannot start {self.service.freecad_cmd}: {e}")
+        while True:
+            build, script, source = self.service.jobs.get()
+            try:
+                self.service.run(self, build, script, source)
+            except Exception as e:
+                # Fail the build rather than lose this worker thread
+                build.error = str(e)
+                build.status = "failed"
+                build.finished.set()
+
+
+# ══════════════════════════════════════════
+# HTTP
+# ══════════════════════════════════════════
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def send_json(self, code, data):
+        body = json.dumps(data, indent=2).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route(self):
+        url = urlparse(self.path)
+        return [p for p in url.path.split("/") if p], parse_qs(url.query)
+
+    def do_GET(self):
+        path, _ = self.route()
+        if path == ["parts"]:
+            return self.send_json(200, self.service.describe())
+        if len(path) in (2, 3) and path[0] == "builds":
+            build = self.service.get(path[1])
+            if build is None:
+                return self.send_json(404, {"error": "unknown build"})
+            if len(path) == 2:
+                return self.send_json(200, build.to_json())
+            file_path = self.service.artifact_path(build, path[2])
+            if file_path is None:
+                return self.send_json(404, {"error": "unknown artifact"})
+            return self.send_file(file_path)
+        self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path, query = self.route()
+        if path != ["builds"]:
+            return self.send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError("invalid Content-Length")
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request must be an object")
+            build = self.service.submit(request.get("part"), request.get("params", {}))
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        if query.get("wait", ["0"])[0] not in ("0", ""):
+            build.finished.wait(self.service.timeout)
+        codes = {"done": 200, "failed": 500}
+        self.send_json(codes.get(build.status, 202), build.to_json())
+
+    def send_file(self, file_path):
+        ctype = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(os.path.getsize(file_path)))
+        self.send_header(
+            "Content-Disposition",
+            f'attachment; filename="{os.path.basename(file_path)}"',
+        )
+        self.end_headers()
+        with open(file_path, "rb") as f:
+            shutil.copyfileobj(f, self.wfile)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--store", default=os.path.expanduser("~/.cache/chocofi-builds")
+    )
+    parser.add_argument(
+        "--freecad", default="freecadcmd", help="headless FreeCAD executable"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=600.0, help="seconds per build"
+    )
+    args = parser.parse_args(argv)
+
+    Handler.service = BuildService(args.store, args.workers, args.freecad, args.timeout)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Chocofi build service -> http://{args.host}:{args.port}")
+    print(f"  Workers: {args.workers} x {args.freecad}")
+    print(f"  Store:   {args.store}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
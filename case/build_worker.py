@@ -0,0 +1,145 @@
+"""
+Chocofi Build Worker
+====================
+Run headless: freecadcmd case/build_worker.py
+
+Long-lived FreeCAD process used by build_service.py. Reads one JSON job per
+line on stdin, runs top.py / bottom.py with parameter overrides and writes the
+result back as a single tagged JSON line on stdout.
+
+Job:    {"script": "/abs/top.py", "source": "...", "params": {"TOWER_HEIGHT": 8.0},
+         "output_dir": "/abs/dir"}
+Result: {"ok": true, "log": "..."}  or  {"ok": false, "error": "...", "log": "..."}
+
+The parameter helpers below have no FreeCAD dependency so the service can
+import them to validate requests.
+"""
+
+import ast
+import contextlib
+import io
+import json
+import sys
+import traceback
+
+# Prefix for protocol lines; anything else on stdout is FreeCAD console noise
+RESULT_TAG = "@@chocofi-build "
+
+# ══════════════════════════════════════════
+# PARAMETER HELPERS
+# ══════════════════════════════════════════
+
+_BINOPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+}
+
+
+def _const_value(node):
+    """Evaluate a numeric literal expression (e.g. 5.4 + 1.7), else None."""
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return node.value
+        return None
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _const_value(node.operand)
+        if value is None:
+            return None
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        left = _const_value(node.left)
+        right = _const_value(node.right)
+        if left is None or right is None:
+            return None
+        return _BINOPS[type(node.op)](left, right)
+    return None
+
+
+def _top_level_assignments(tree):
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+        ):
+            yield node.targets[0].id, node
+
+
+def overridable_params(source):
+    """Top-level UPPER_CASE numeric constants of a case script -> default value.
+
+    Derived values (CHOC_HOLE = CHOC_CUTOUT + ...) are not listed; they follow
+    from the constants they are computed from.
+    """
+    params = {}
+    for name, node in _top_level_assignments(ast.parse(source)):
+        if not name.isupper():
+            continue
+        value = _const_value(node.value)
+        if value is not None:
+            params[name] = value
+    return params
+
+
+def apply_overrides(source, overrides, filename="<case>"):
+    """Compile a case script with top-level constants replaced by overrides."""
+    tree = ast.parse(source, filename)
+    missing = set(overrides)
+    for name, node in _top_level_assignments(tree):
+        if name in overrides:
+            node.value = ast.copy_location(ast.Constant(overrides[name]), node.value)
+            missing.discard(name)
+    if missing:
+        raise KeyError(f"unknown parameter(s): {', '.join(sorted(missing))}")
+    return compile(ast.fix_missing_locations(tree), filename, "exec")
+
+
+# ══════════════════════════════════════════
+# WORKER LOOP
+# ══════════════════════════════════════════
+
+
+def run_job(job):
+    import FreeCAD
+
+    # The service sends the source it hashed, so edits made to the script while
+    # a build is queued cannot end up under the wrong cache key
+    source = job["source"]
+    overrides = dict(job.get("params", {}))
+    overrides["OUTPUT_DIR"] = job["output_dir"]
+    code = apply_overrides(source, overrides, job["script"])
+
+    docs_before = set(FreeCAD.listDocuments())
+    try:
+        exec(code, {"__name__": "chocofi_build", "__file__": job["script"]})
+    finally:
+        # Keep the warm process from accumulating one document per build
+        for name in set(FreeCAD.listDocuments()) - docs_before:
+            FreeCAD.closeDocument(name)
+
+
+def serve(stdin=sys.stdin, stdout=sys.stdout):
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        log = io.StringIO()
+        try:
+            job = json.loads(line)
+            with contextlib.redirect_stdout(log):
+                run_job(job)
+            result = {"ok": True, "log": log.getvalue()}
+        except Exception:
+            result = {
+                "ok": False,
+                "error": traceback.format_exc(),
+                "log": log.getvalue(),
+            }
+        stdout.write(RESULT_TAG + json.dumps(result) + "\n")
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,496 @@
+"""
+Chocofi Section Report
+======================
+Run in FreeCAD: CASE_DIR = "/path/to/case"; exec(open(CASE_DIR + "/report.py").read())
+Headless:       freecadcmd case/report.py
+
+Builds top.py / bottom.py without exporting, slices the BREP at Z heights and
+named planes and measures key dimensions on the section wires. Nothing is
+tessellated, so this is much cheaper than an STL round trip for reviews.
+
+Writes <part>_report.json (nominal vs measured) and <part>_report.svg
+(section outlines with the measured chords in red).
+
+Named planes:
+- top:    screen (X = SCREEN_CX), tower (Y = TOWER_CY), groove, hole_1..hole_7
+- bottom: wall, hole_1..hole_7
+"""
+
+import FreeCAD
+import Part
+import json
+import os
+import sys
+
+# ══════════════════════════════════════════
+# PARAMETERS
+# ══════════════════════════════════════════
+# The repo's case/ directory. Found from __file__ when run as a script; set it
+# by hand when exec'd from the FreeCAD console (no __file__ there).
+CASE_DIR = None
+OUTPUT_DIR = os.path.expanduser("~")  # where the report is written
+
+PART = "top"  # "top" or "bottom"
+PARAMS = {}  # overrides for the case script, e.g. {"TOWER_HEIGHT": 8.0}
+PLANES = []  # named planes to report, empty = all
+Z_HEIGHTS = []  # extra Z sections (mm), added to the part's defaults
+
+SVG_SCALE = 4.0  # px per mm
+SVG_MARGIN = 24  # px around and between panels
+CURVE_DEFLECTION = 0.02  # mm, only used to draw section wires in the SVG
+CONE_PROBE = 0.05  # mm inside each end of the countersink where it is probed
+
+SCRIPTS = {
+    "top": ("top.py", "plate"),
+    "bottom": ("bottom.py", "case"),
+}
+
+if CASE_DIR is None and "__file__" in globals():
+    CASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if CASE_DIR is None:
+    raise RuntimeError(
+        "report.py: set CASE_DIR to the path of the repo's case/ directory "
+        "before exec'ing this file from the FreeCAD console"
+    )
+if CASE_DIR not in sys.path:
+    sys.path.insert(0, CASE_DIR)
+from build_worker import apply_overrides  # noqa: E402
+
+X = FreeCAD.Vector(1, 0, 0)
+Y = FreeCAD.Vector(0, 1, 0)
+Z = FreeCAD.Vector(0, 0, 1)
+KICAD_Y = FreeCAD.Vector(0, -1, 0)  # FreeCAD Y is flipped from KiCad
+
+# ══════════════════════════════════════════
+# SECTIONS
+# ══════════════════════════════════════════
+
+
+class Section:
+    """Planar section of a solid with an in-plane (u, v) coordinate frame.
+
+    Chords are straight probes in the plane: boundary crossings come from the
+    section wires, and each span between crossings is classified against the
+    solid. Only the solid spans are returned, as (start, end) distances from
+    the chord start.
+    """
+
+    def __init__(self, name, shape, origin, u, v):
+        self.name = name
+        self.shape = shape
+        self.origin = origin
+        self.u = u
+        self.v = v
+        self.normal = u.cross(v)
+        self.wires = shape.slice(self.normal, self.normal.dot(origin))
+        self.chords = []
+        self.measurements = []
+
+    def point(self, u, v):
+        return self.origin + self.u * u + self.v * v
+
+    def chord(self, a, b):
+        pa, pb = self.point(*a), self.point(*b)
+        direction = pb - pa
+        length = direction.Length
+        direction.normalize()
+        self.chords.append((a, b))
+        if not self.wires:
+            return []
+
+        line = Part.makeLine(pa, pb)
+        hits = line.section(Part.Compound(self.wires)).Vertexes
+        cuts = sorted({0.0, length} | {(h.Point - pa).dot(direction) for h in hits})
+
+        spans = []
+        for t0, t1 in zip(cuts, cuts[1:]):
+            if t1 - t0 < 1e-6:
+                continue
+            if not self.shape.isInside(pa + direction * ((t0 + t1) / 2), 1e-6, True):
+                continue
+            if spans and abs(spans[-1][1] - t0) < 1e-6:
+                spans[-1] = (spans[-1][0], t1)
+            else:
+                spans.append((t0, t1))
+        return spans
+
+    def measure(self, name, nominal, measured):
+        self.measurements.append(
+            {
+                "name": name,
+                "nominal": round(nominal, 4),
+                "measured": None if measured is None else round(measured, 4),
+                "delta": None if measured is None else round(measured - nominal, 4),
+            }
+        )
+
+    def to_json(self):
+        data = {
+            "name": self.name,
+            "origin": [round(c, 4) for c in self.origin],
+            "normal": [round(c, 4) for c in self.normal],
+            "wires": len(self.wires),
+        }
+        if self.measurements:
+            data["measurements"] = self.measurements
+        return data
+
+
+def z_section(shape, z):
+    section = Section(f"z={z:.2f}", shape, FreeCAD.Vector(0, 0, z), X, Y)
+    closed = [w for w in section.wires if w.isClosed()]
+    if closed:
+        face = Part.makeFace(closed, "Part::FaceMakerBullseye")
+        bb = face.BoundBox
+        section.stats = {
+            "area": round(face.Area, 3),
+            "perimeter": round(sum(w.Length for w in closed), 3),
+            "size": [round(bb.XLength, 3), round(bb.YLength, 3)],
+        }
+    else:
+        section.stats = {}
+    return section
+
+
+def solid(spans, i):
+    return spans[i][1] - spans[i][0] if len(spans) > i else None
+
+
+def gap(spans, i):
+    return spans[i + 1][0] - spans[i][1] if len(spans) > i + 1 else None
+
+
+def start(spans, i):
+    return spans[i][0] if len(spans) > i else None
+
+
+def end(spans, i):
+    return spans[i][1] if len(spans) > i else None
+
+
+def extent(spans):
+    return spans[-1][1] - spans[0][0] if spans else None
+
+
+def diff(a, b):
+    return None if a is None or b is None else a - b
+
+
+def edge_probe(pcb_wire, offset):
+    """Point on the PCB outline offset (middle of its longest edge) and the
+    horizontal unit vector pointing back in towards the PCB."""
+    edge = max(pcb_wire.makeOffset2D(offset).Edges, key=lambda e: e.Length)
+    p = edge.valueAt((edge.FirstParameter + edge.LastParameter) / 2.0)
+    q = pcb_wire.distToShape(Part.Vertex(p))[1][0][0]
+    inward = q - p
+    inward.normalize()
+    return p, inward
+
+
+# ══════════════════════════════════════════
+# PART MEASUREMENTS
+# ══════════════════════════════════════════
+
+
+def wanted(name):
+    """Planes are only sliced when PLANES is empty or names them."""
+    return not PLANES or name in PLANES
+
+
+def top_sections(ns, shape):
+    g = ns.get
+    pt = g("PLATE_THICKNESS")
+    z_base = g("tower_z_base")
+    z_top = g("tower_top_z")
+    wall = g("TOWER_WALL")
+
+    # ── Screen plane: X = SCREEN_CX, u = KiCad Y ──
+    if wanted("screen"):
+        s = Section("screen", shape, FreeCAD.Vector(g("SCREEN_CX"), 0, 0), KICAD_Y, Z)
+        front = g("TOWER_FRONT_Y") - 1
+        back = g("TOWER_FRONT_Y") + g("OUTER_Y") + 1
+        s.measure(
+            "screen_window_length",
+            g("NV_SCREEN_W"),
+            gap(s.chord((front, z_top - wall / 2), (back, z_top - wall / 2)), 0),
+        )
+        s.measure(
+            "cavity_length",
+            g("CAVITY_Y"),
+            gap(s.chord((front, z_base + 1.5), (back, z_base + 1.5)), 0),
+        )
+        lid = s.chord(
+            (g("TOWER_FRONT_Y") + wall + 2, 0),
+            (g("TOWER_FRONT_Y") + wall + 2, z_top + 2),
+        )
+        s.measure("lid_thickness", wall, solid(lid, 0))
+        s.measure("tower_top_z", z_top, end(lid, 0))
+        yield s
+
+    # ── Tower plane: Y = TOWER_CY, u = X ──
+    if wanted("tower"):
+        s = Section("tower", shape, FreeCAD.Vector(0, -g("TOWER_CY"), 0), X, Z)
+        left = g("TOWER_LEFT") - 1
+        right = g("TOWER_RIGHT") + 1
+        guide_z = z_base + 3 + g("GUIDE_WALL_H") / 4
+        s.measure(
+            "guide_spacing",
+            2 * g("GUIDE_OFFSET"),
+            gap(s.chord((left, guide_z), (right, guide_z)), 0),
+        )
+        cavity = s.chord((left, z_base + 1.5), (right, z_base + 1.5))
+        s.measure("cavity_width", g("HOLE_X"), gap(cavity, 0))
+        s.measure(
+            "tower_width",
+            g("tower_actual_w"),
+            extent(cavity),
+        )
+        s.measure(
+            "screen_window_width",
+            g("NV_SCREEN_H"),
+            gap(s.chord((left, z_top - wall / 2), (right, z_top - wall / 2)), 0),
+        )
+        yield s
+
+    # ── Groove plane: across the longest straight run of the groove ──
+    groove_w = g("GROOVE_WIDTH") + g("GROOVE_TOLERANCE")
+    groove_d = g("GROOVE_DEPTH")
+    if wanted("groove"):
+        p, inward = edge_probe(g("pcb_wire"), g("outer_offset") - groove_w / 2)
+        s = Section("groove", shape, p, inward, Z)
+        # Depth = groove roof above the skirt bottom, both probed from one
+        # fixed Z so nothing else hanging below the skirt can skew it
+        v0 = -groove_d - 1
+        skirt_u = groove_w / 2 + (g("BORDER_WIDTH") - groove_w) / 2
+        roof = start(s.chord((0, v0), (0, pt + 1)), 0)
+        skirt_bottom = start(s.chord((skirt_u, v0), (skirt_u, pt + 1)), 0)
+        s.measure("groove_depth", groove_d, diff(roof, skirt_bottom))
+        u0 = -groove_w / 2 - 1
+        plate_row = s.chord((u0, pt / 2), (u0 + 5, pt / 2))
+        skirt_row = s.chord((u0, -groove_d / 2), (u0 + 5, -groove_d / 2))
+        s.measure(
+            "groove_width", groove_w, diff(start(skirt_row, 0), start(plate_row, 0))
+        )
+        s.measure(
+            "skirt_thickness",
+            g("BORDER_WIDTH") - groove_w,
+            solid(skirt_row, 0),
+        )
+        yield s
+
+    # ── Mounting holes: X = hole center, u = KiCad Y ──
+    through = g("M2_THROUGH")
+    head = g("M2_HEAD_D")
+    head_depth = g("M2_HEAD_DEPTH")
+    cone_base = pt - head_depth
+
+    def cone_d(z):
+        # Countersink opens upwards: through hole at its base, head at the top
+        return through + (head - through) * (z - cone_base) / head_depth
+
+    # Probing near both ends as well as mid-height shows which way the cone faces
+    cone_probes = [
+        ("countersink_top_d", pt - CONE_PROBE),
+        ("countersink_mid_d", cone_base + head_depth / 2),
+        ("countersink_base_d", cone_base + CONE_PROBE),
+    ]
+    for i, (mx, my) in enumerate(g("MOUNTING_HOLES"), 1):
+        if not wanted(f"hole_{i}"):
+            continue
+        s = Section(f"hole_{i}", shape, FreeCAD.Vector(mx, 0, 0), KICAD_Y, Z)
+        z = (pt - head_depth) / 2
+        s.measure("through_d", through, gap(s.chord((my - head, z), (my + head, z)), 0))
+        for name, cz in cone_probes:
+            s.measure(
+                name, cone_d(cz), gap(s.chord((my - head, cz), (my + head, cz)), 0)
+            )
+        s.measure(
+            "plate_thickness",
+            pt,
+            solid(s.chord((my + head, -1), (my + head, pt + 1)), 0),
+        )
+        yield s
+
+
+def bottom_sections(ns, shape):
+    g = ns.get
+    floor = g("FLOOR_THICKNESS")
+    wall_top = floor + g("WALL_HEIGHT")
+    wall = g("WALL_THICKNESS")
+    ridge_w = g("RIDGE_WIDTH")
+
+    # ── Wall plane: across the longest straight run of the wall ──
+    if wanted("wall"):
+        p, inward = edge_probe(g("pcb_wire"), g("TOLERANCE") + wall / 2)
+        s = Section("wall", shape, p, inward, Z)
+        mid = floor + g("WALL_HEIGHT") / 2
+        s.measure(
+            "wall_thickness",
+            wall,
+            solid(s.chord((-wall / 2 - 1, mid), (wall / 2 + 1, mid)), 0),
+        )
+        inner = end(s.chord((ridge_w / 2, 0), (ridge_w / 2, wall_top + 1)), 0)
+        outer = end(
+            s.chord(
+                (-wall / 2 + ridge_w / 2, 0), (-wall / 2 + ridge_w / 2, wall_top + 4)
+            ),
+            0,
+        )
+        s.measure("wall_top_z", wall_top, inner)
+        s.measure("ridge_height", g("RIDGE_HEIGHT"), diff(outer, inner))
+        ridge_z = wall_top + g("RIDGE_HEIGHT") / 2
+        s.measure(
+            "ridge_width",
+            ridge_w,
+            solid(s.chord((-wall / 2 - 1, ridge_z), (wall / 2 + 1, ridge_z)), 0),
+        )
+        yield s
+
+    # ── Standoffs: X = hole center, u = KiCad Y ──
+    post_r = g("STANDOFF_OUTER_R")
+    insert_d = g("INSERT_HOLE_D")
+    standoff_top = floor + g("STANDOFF_HEIGHT")
+    for i, (mx, my) in enumerate(g("MOUNTING_HOLES"), 1):
+        if not wanted(f"hole_{i}"):
+            continue
+        s = Section(f"hole_{i}", shape, FreeCAD.Vector(mx, 0, 0), KICAD_Y, Z)
+        half = (post_r + insert_d / 2) / 2  # middle of the post wall
+        post_u = my + half
+        post = end(s.chord((post_u, 0), (post_u, standoff_top + 1)), 0)
+        bore = end(s.chord((my, 0), (my, standoff_top + 1)), 0)
+        s.measure("standoff_top_z", standoff_top, post)
+        s.measure("insert_depth", g("INSERT_HOLE_DEPTH"), diff(post, bore))
+        z = standoff_top - g("INSERT_HOLE_DEPTH") / 2
+        s.measure(
+            "insert_d",
+            insert_d,
+            gap(s.chord((my - half, z), (my + half, z)), 0),
+        )
+        s.measure(
+            "floor_thickness",
+            floor,
+            solid(s.chord((my + post_r + 1, -1), (my + post_r + 1, floor + 1)), 0),
+        )
+        yield s
+
+
+def default_z_heights(ns):
+    g = ns.get
+    if PART == "top":
+        return [
+            -g("GROOVE_DEPTH") / 2,
+            g("PLATE_THICKNESS") / 2,
+            g("tower_z_base") + 1.5,
+            g("tower_top_z") - g("TOWER_WALL") / 2,
+        ]
+    return [
+        g("FLOOR_THICKNESS") / 2,
+        g("FLOOR_THICKNESS") + g("STANDOFF_HEIGHT") / 2,
+        g("FLOOR_THICKNESS") + g("WALL_HEIGHT") + g("RIDGE_HEIGHT") / 2,
+    ]
+
+
+# ══════════════════════════════════════════
+# SVG
+# ══════════════════════════════════════════
+
+
+def section_polylines(section):
+    lines = []
+    for wire in section.wires:
+        for edge in wire.Edges:
+            pts = edge.discretize(Deflection=CURVE_DEFLECTION)
+            lines.append(
+                [
+                    (
+                        (p - section.origin).dot(section.u),
+                        (p - section.origin).dot(section.v),
+                    )
+                    for p in pts
+                ]
+            )
+    return lines
+
+
+def write_svg(path, sections):
+    panels = []
+    y = SVG_MARGIN
+    width = 0
+    for section in sections:
+        lines = section_polylines(section)
+        pts = [p for line in lines for p in line] + [
+            p for c in section.chords for p in c
+        ]
+        if not pts:
+            continue
+        u_min = min(p[0] for p in pts)
+        v_max = max(p[1] for p in pts)
+        w = (max(p[0] for p in pts) - u_min) * SVG_SCALE
+        h = (v_max - min(p[1] for p in pts)) * SVG_SCALE
+
+        top = y + 14  # below the panel title
+
+        def xy(p):
+            return (
+                f"{SVG_MARGIN + (p[0] - u_min) * SVG_SCALE:.2f},"
+                f"{top + (v_max - p[1]) * SVG_SCALE:.2f}"
+            )
+
+        body = [f'<text x="{SVG_MARGIN}" y="{y + 10}">{section.name}</text>']
+        for line in lines:
+            body.append(
+                f'<polyline class="w" points="{" ".join(xy(p) for p in line)}"/>'
+            )
+        for a, b in section.chords:
+            body.append(f'<polyline class="c" points="{xy(a)} {xy(b)}"/>')
+        panels.extend(body)
+        y += 14 + h + SVG_MARGIN
+        width = max(width, w + 2 * SVG_MARGIN)
+
+    with open(path, "w") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{y:.0f}">\n'
+            "<style>.w{fill:none;stroke:#000;stroke-width:1}"
+            ".c{fill:none;stroke:#d00;stroke-width:1}"
+            "text{font:11px monospace}</style>\n"
+        )
+        f.write("\n".join(panels))
+        f.write("\n</svg>\n")
+
+
+# ══════════════════════════════════════════
+# BUILD + REPORT
+# ══════════════════════════════════════════
+script_name, shape_var = SCRIPTS[PART]
+script_path = os.path.join(CASE_DIR, script_name)
+with open(script_path) as f:
+    source = f.read()
+
+ns = {"__name__": "chocofi_report", "__file__": script_path}
+exec(apply_overrides(source, {**PARAMS, "EXPORT": False}, script_path), ns)
+shape = ns[shape_var]
+
+sections = list((top_sections if PART == "top" else bottom_sections)(ns, shape))
+z_sections = [z_section(shape, z) for z in default_z_heights(ns) + list(Z_HEIGHTS)]
+
+report = {
+    "part": PART,
+    "params": PARAMS,
+    "planes": [s.to_json() for s in sections],
+    "z_sections": [dict(s.to_json(), **s.stats) for s in z_sections],
+}
+
+json_path = os.path.join(OUTPUT_DIR, f"chocofi_{PART}_report.json")
+with open(json_path, "w") as f:
+    json.dump(report, f, indent=2)
+print(f"JSON -> {json_path}")
+
+svg_path = os.path.join(OUTPUT_DIR, f"chocofi_{PART}_report.svg")
+write_svg(svg_path, sections + z_sections)
+print(f"SVG  -> {svg_path}")
+
+print(f"\nDone! {len(sections)} planes, {len(z_sections)} Z sections")
+for s in sections:
+    for m in s.measurements:
+        measured = "missing" if m["measured"] is None else f"{m['measured']:.3f}"
+        print(f"  {s.name:<8} {m['name']:<22} {m['nominal']:>8.3f} -> {measured}")
@@ -19,6 +19,10 @@ import os
 # PARAMETERS
 # ══════════════════════════════════════════
 
+# ── Output ──
+OUTPUT_DIR = os.path.expanduser("~")  # where STEP/STL are written
+EXPORT = True  # False builds the shape only (see report.py)
+
 # ── Plate ──
 PLATE_THICKNESS = 1.6  # mm
 BORDER_WIDTH = 2.2  # mm (matches bottom case wall)
@@ -498,23 +502,24 @@ for mx, my in MOUNTING_HOLES:
 # ══════════════════════════════════════════
 # EXPORT
 # ══════════════════════════════════════════
-doc = FreeCAD.newDocument("ChocofiTopPlate")
-part = doc.addObject("Part::Feature", "ChocofiTopPlate")
-part.Shape = plate
-doc.recompute()
-
-step_path = os.path.expanduser("~/chocofi_top_plate.step")
-Part.export([part], step_path)
-print(f"STEP -> {step_path}")
-
-try:
-    import Mesh
-
-    stl_path = os.path.expanduser("~/chocofi_top_plate.stl")
-    Mesh.export([part], stl_path)
-    print(f"STL  -> {stl_path}")
-except Exception as e:
-    print(f"STL export failed: {e}")
+if EXPORT:
+    doc = FreeCAD.newDocument("ChocofiTopPlate")
+    part = doc.addObject("Part::Feature", "ChocofiTopPlate")
+    part.Shape = plate
+    doc.recompute()
+
+    step_path = os.path.join(OUTPUT_DIR, "chocofi_top_plate.step")
+    Part.export([part], step_path)
+    print(f"STEP -> {step_path}")
+
+    try:
+        import Mesh
+
+        stl_path = os.path.join(OUTPUT_DIR, "chocofi_top_plate.stl")
+        Mesh.export([part], stl_path)
+        print(f"STL  -> {stl_path}")
+    except Exception as e:
+        print(f"STL export failed: {e}")
 
 bb = plate.BoundBox
 print(f"\nDone! Top plate: {bb.XLength:.1f} x {bb.YLength:.1f} x {bb.ZLength:.1f} mm")